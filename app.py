@@ -1,30 +1,45 @@
+import base64
+import binascii
+import hashlib
+import hmac
 import http
 import json
+import math
 import os
 import random
 import re
-from typing import Any, Callable, Final, TypeVar, Union, cast
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Callable, Final, Iterator, Optional, TypeVar, Union, cast
 
 import requests
 from dotenv import load_dotenv
-from flask import Flask, request
+from flask import Flask, Response, g, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
 from flask_caching import Cache
 from newsdataapi import NewsDataApiClient, newsdataapi_exception
 from werkzeug.exceptions import BadRequestKeyError
 
 from data_types import (
+    AdmissionStats,
     BiasAnalysisError,
     BiasAnalysisSuccess,
     BiasOkResponse,
+    CompactNews,
+    CompactNewsPage,
     ErrorResponse,
     GatewayTimeoutResponse,
     InternalErrorResponse,
-    News,
+    MetricsOkResponse,
     NewsApiParam,
     NewsDataApiParam,
-    NewsWithSentiment,
+    PruningStats,
+    SearchCursor,
     SearchError,
     SearchOkResponse,
+    SearchPosition,
     SearchSuccess,
     SearchWithFilterOkResponse,
     SearchWithSentimentSuccess,
@@ -38,9 +53,19 @@ from data_types import (
     SimilarityAnalysisError,
     SimilarityAnalysisSuccess,
 )
-from news_traveler_document_similarity.tfidf_similarity import process_tfidf_similarity
+from news_traveler_admission_control.admission_control import (
+    AdmissionLimiter,
+    Overloaded,
+)
+from news_traveler_document_similarity.candidate_pruning import CandidatePruner
+from news_traveler_document_similarity.tfidf_similarity import (
+    process_tfidf_similarity_from_counts,
+    tokenize_document,
+    tokenize_words,
+)
+from news_traveler_profiling.sampling_profiler import SamplingProfiler
 from news_traveler_sentiment_analysis.sentiment_analysis import (
-    sentiment_analysis_per_document,
+    sentence_sentiment_analysis_per_document,
 )
 
 CACHE_DEFAULT_TIMEOUT = 60 * 60 * 24  # 1 day
@@ -49,6 +74,22 @@ config = {
     "DEBUG": True,
     "CACHE_TYPE": "SimpleCache",
     "CACHE_DEFAULT_TIMEOUT": CACHE_DEFAULT_TIMEOUT,
+    "SENTIMENT_MAX_ANALYZED_LENGTH": None,
+    "SEARCH_DEADLINE": 10.0,  # seconds
+    "SEARCH_DEADLINE_LIMIT": 30.0,
+    "SEARCH_PAGE_BUDGET": 5,
+    "SEARCH_PAGE_BUDGET_LIMIT": 20,
+    "PROFILE_TOKEN": None,  # enables profiling via the X-Profile-Token header
+    "PROFILE_SAMPLE_RATE": 0.0,
+    "PROFILE_INTERVAL": 0.005,  # seconds between stack samples
+    "PROFILE_LATENCY_THRESHOLD": 1.0,  # seconds
+    "PROFILE_DIR": "profiles",
+    "ADMISSION_MAX_CONCURRENCY": 16,
+    "ADMISSION_ROUTE_CONCURRENCY": {"search_with_filters": 4},
+    "ADMISSION_UPSTREAM_CONCURRENCY": {"newsdataapi": 4, "newsapi": 4, "biasapi": 4},
+    "ADMISSION_MAX_QUEUE": 32,
+    "ADMISSION_QUEUE_TIMEOUT": 5.0,  # seconds
+    "ADMISSION_RETRY_AFTER": 5,  # seconds
 }
 
 app = Flask(__name__)
@@ -56,6 +97,7 @@ app.config.from_mapping(config)
 cache = Cache(app)
 
 load_dotenv()
+app.config.from_prefixed_env()
 
 newsdataapi_keys_re = re.compile(r"NEWSDATAAPI_KEY_(\d+)")
 NEWSDATAAPI_KEY = [
@@ -66,6 +108,170 @@ NEWSAPI_KEY = os.environ["NEWSAPI_KEY"]
 BIASAPI_KEY = os.environ["BIASAPI_KEY"]
 
 
+@contextmanager
+def timed_stage(name: str) -> Iterator[None]:
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        if has_request_context():
+            stage_durations = g.setdefault("stage_durations", {})
+            stage_durations[name] = (
+                stage_durations.get(name, 0.0) + time.perf_counter() - started_at
+            )
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    def response(self, *args: Any, **kwargs: Any):
+        with timed_stage("serialize"):
+            return super().response(*args, **kwargs)
+
+
+app.json = TimedJSONProvider(app)
+
+
+@app.before_request
+def start_request_clock() -> None:
+    # Runs before admission so queueing counts against request deadlines
+    g.request_started_at = time.monotonic()
+
+
+@app.before_request
+def start_profiling() -> None:
+    token = app.config["PROFILE_TOKEN"]
+    requested = token is not None and hmac.compare_digest(
+        request.headers.get("X-Profile-Token", "").encode("utf-8"),
+        str(token).encode("utf-8"),
+    )
+    if requested or random.random() < app.config["PROFILE_SAMPLE_RATE"]:
+        g.profiler = SamplingProfiler(app.config["PROFILE_INTERVAL"])
+        g.profiler.start()
+
+
+@app.after_request
+def finish_profiling(response: Response) -> Response:
+    profiler: Optional[SamplingProfiler] = g.pop("profiler", None)
+    if profiler is None:
+        return response
+    profiler.stop()
+    elapsed = time.monotonic() - g.request_started_at
+    response.headers["Server-Timing"] = ", ".join(
+        [
+            f"{name};dur={duration * 1000:.1f}"
+            for name, duration in g.get("stage_durations", {}).items()
+        ]
+        + [f"total;dur={elapsed * 1000:.1f}"]
+    )
+    if elapsed >= app.config["PROFILE_LATENCY_THRESHOLD"]:
+        path = os.path.join(
+            app.config["PROFILE_DIR"],
+            f"{time.strftime('%Y%m%d-%H%M%S')}-{request.endpoint}-{uuid.uuid4().hex[:8]}",
+        )
+        try:
+            os.makedirs(app.config["PROFILE_DIR"], exist_ok=True)
+            profiler.write_speedscope(
+                f"{path}.speedscope.json", f"{request.method} {request.path}"
+            )
+            profiler.write_collapsed(f"{path}.collapsed")
+        except OSError:
+            # A broken profile directory must not fail the profiled request
+            app.logger.exception("failed to write profile to %s", path)
+    return response
+
+
+@app.teardown_request
+def stop_profiling(exception: Optional[BaseException]) -> None:
+    # after_request is skipped when the view raised
+    profiler: Optional[SamplingProfiler] = g.pop("profiler", None)
+    if profiler is not None:
+        profiler.stop()
+
+
+# Lower values are admitted first; cold scans wait behind cheap requests
+CHEAP_PRIORITY: Final = 0
+SCAN_PRIORITY: Final = 1
+ROUTE_PRIORITY: Final = {"search_with_filters": SCAN_PRIORITY}
+UNLIMITED_ROUTES: Final = {"get_metrics", "static"}
+
+
+def _create_limiter(name: str, limit: int, status_code: int) -> AdmissionLimiter:
+    return AdmissionLimiter(
+        name,
+        limit,
+        app.config["ADMISSION_MAX_QUEUE"],
+        app.config["ADMISSION_QUEUE_TIMEOUT"],
+        status_code,
+        app.config["ADMISSION_RETRY_AFTER"],
+    )
+
+
+server_limiter = _create_limiter(
+    "server",
+    app.config["ADMISSION_MAX_CONCURRENCY"],
+    http.HTTPStatus.SERVICE_UNAVAILABLE,
+)
+route_limiters = {
+    endpoint: _create_limiter(
+        f"route:{endpoint}", limit, http.HTTPStatus.TOO_MANY_REQUESTS
+    )
+    for endpoint, limit in app.config["ADMISSION_ROUTE_CONCURRENCY"].items()
+}
+upstream_limiters = {
+    upstream: _create_limiter(
+        f"upstream:{upstream}", limit, http.HTTPStatus.SERVICE_UNAVAILABLE
+    )
+    for upstream, limit in app.config["ADMISSION_UPSTREAM_CONCURRENCY"].items()
+}
+
+
+candidate_pruner = CandidatePruner()
+
+
+def admission_priority() -> int:
+    return (
+        g.get("admission_priority", CHEAP_PRIORITY)
+        if has_request_context()
+        else CHEAP_PRIORITY
+    )
+
+
+def admission_timeout() -> Optional[float]:
+    # Waiting for an upstream slot must not outlast the request's deadline
+    deadline = g.get("request_deadline") if has_request_context() else None
+    return None if deadline is None else max(deadline - time.monotonic(), 0.0)
+
+
+@app.before_request
+def admit_request() -> None:
+    endpoint = request.endpoint or ""
+    if endpoint in UNLIMITED_ROUTES:
+        return
+    g.admission_priority = ROUTE_PRIORITY.get(endpoint, CHEAP_PRIORITY)
+    g.admitted = []
+    limiters = [server_limiter]
+    if endpoint in route_limiters:
+        limiters.insert(0, route_limiters[endpoint])
+    with timed_stage("queue"):
+        for limiter in limiters:
+            limiter.acquire(g.admission_priority)
+            g.admitted.append(limiter)
+
+
+@app.teardown_request
+def release_admission(exception: Optional[BaseException]) -> None:
+    for limiter in reversed(g.pop("admitted", [])):
+        limiter.release()
+
+
+@app.errorhandler(Overloaded)
+def shed_request(e: Overloaded) -> tuple[ErrorResponse, int, dict[str, str]]:
+    return (
+        {"message": f"{e.name} is saturated, retry later"},
+        e.status_code,
+        {"Retry-After": str(e.retry_after)},
+    )
+
+
 # A workaround for not using NotRequired
 def generate_newsdataapi_param(
     q,
@@ -121,16 +327,20 @@ SearchParam = TypeVar("SearchParam", NewsDataApiParam, NewsApiParam)
 
 @cache.memoize(CACHE_DEFAULT_TIMEOUT)
 def _request_newsdataapi(params: NewsDataApiParam) -> Any:
-    api = NewsDataApiClient(apikey=random.choice(NEWSDATAAPI_KEY))
-    return api.news_api(**params)
+    with upstream_limiters["newsdataapi"].limit_concurrency(
+        admission_priority(), admission_timeout()
+    ):
+        api = NewsDataApiClient(apikey=random.choice(NEWSDATAAPI_KEY))
+        return api.news_api(**params)
 
 
+@timed_stage("fetch")
 @cache.memoize(CACHE_DEFAULT_TIMEOUT)
 def request_newsdataapi(
     params: NewsDataApiParam, count: int, exact_count: bool
 ) -> Union[SearchSuccess, SearchError]:
     MAX_CALL_COUNT: Final = 5
-    collected_news: list[News] = []
+    collected_news: list[CompactNews] = []
     call_count = 0
     while len(collected_news) < count and call_count < MAX_CALL_COUNT:
         try:
@@ -140,6 +350,7 @@ def request_newsdataapi(
                 "status_code": http.HTTPStatus.INTERNAL_SERVER_ERROR,
                 "message": json.loads(str(e).replace("'", '"'))["results"]["message"],
             }
+        call_count += 1
         if response["status"] == "error":
             return {
                 "status_code": http.HTTPStatus.BAD_REQUEST,
@@ -147,25 +358,22 @@ def request_newsdataapi(
             }
         collected_news.extend(
             [
-                cast(
-                    News,
-                    {
-                        "source": news["source_id"],
-                        "author": ",".join(news["creator"])
-                        if news["creator"]
-                        else news["source_id"],
-                        "title": news["title"],
-                        "content": news["content"]
-                        if news["description"] is None
-                        else news["description"]
-                        if news["content"] is None
-                        else news["content"]
-                        if len(news["content"]) > len(news["description"])
-                        else news["description"],
-                        "url": news["link"],
-                        "urlToImage": news["image_url"],
-                        "publishedAt": news["pubDate"],
-                    },
+                CompactNews(
+                    source=news["source_id"],
+                    author=",".join(news["creator"])
+                    if news["creator"]
+                    else news["source_id"],
+                    title=news["title"],
+                    content=news["content"]
+                    if news["description"] is None
+                    else news["description"]
+                    if news["content"] is None
+                    else news["content"]
+                    if len(news["content"]) > len(news["description"])
+                    else news["description"],
+                    url=news["link"],
+                    url_to_image=news["image_url"],
+                    published_at=news["pubDate"],
                 )
                 for news in response["results"]
                 if news["title"]
@@ -176,14 +384,22 @@ def request_newsdataapi(
         if response["nextPage"] is None:
             break
         params.update({"page": response["nextPage"]})
-        call_count += 1
     if exact_count:
         collected_news = collected_news[:count]
     if len(collected_news) >= count:
-        return {"news": collected_news, "nextOffset": response["nextPage"]}
-    return {"news": collected_news, "nextOffset": None}
+        return {
+            "news": CompactNewsPage(collected_news),
+            "nextOffset": response["nextPage"],
+            "pageCount": call_count,
+        }
+    return {
+        "news": CompactNewsPage(collected_news),
+        "nextOffset": None,
+        "pageCount": call_count,
+    }
 
 
+@timed_stage("fetch")
 @cache.memoize(CACHE_DEFAULT_TIMEOUT)
 def request_newsapi(
     params: NewsApiParam, count: int, exact_count: bool  # type: ignore
@@ -191,48 +407,56 @@ def request_newsapi(
     _params: dict[str, Any] = {k: v for k, v in params.items() if v is not None} | {
         "apiKey": NEWSAPI_KEY
     }
-    response = requests.get(
-        url="https://newsapi.org/v2/everything",
-        params=_params,
-        timeout=5,
-    )
+    with upstream_limiters["newsapi"].limit_concurrency(
+        admission_priority(), admission_timeout()
+    ):
+        response = requests.get(
+            url="https://newsapi.org/v2/everything",
+            params=_params,
+            timeout=5,
+        )
     if not response.ok:
         return {
             "status_code": response.status_code,
             "message": f'{response.json()["code"]}, {response.json()["message"]}',
         }
     return {
-        "news": [
-            {
-                "source": news["source"],
-                "author": news["author"],
-                "title": news["title"],
-                "content": news["content"]
+        "news": CompactNewsPage(
+            CompactNews(
+                source=news["source"],
+                author=news["author"],
+                title=news["title"],
+                content=news["content"]
                 if news["description"] is None
                 else news["description"]
                 if news["content"] is None
                 else news["content"]
                 if len(news["content"]) > len(news["description"])
                 else news["description"],
-                "url": news["url"],
-                "urlToImage": news["urlToImage"],
-                "publishedAt": news["publishedAt"],
-            }
+                url=news["url"],
+                url_to_image=news["urlToImage"],
+                published_at=news["publishedAt"],
+            )
             for news in response.json()["articles"]
             if news["title"]
             and (news["description"] or news["content"])
             and news["url"]
-        ],
+        ),
         "nextOffset": None,
+        "pageCount": 1,
     }
 
 
+@timed_stage("bias")
 def request_biasapi(article: str) -> Union[BiasAnalysisSuccess, BiasAnalysisError]:
-    response = requests.post(
-        "https://api.thebipartisanpress.com/api/endpoints/beta/robert",
-        data={"API": BIASAPI_KEY, "Text": article},
-        timeout=20,
-    )
+    with upstream_limiters["biasapi"].limit_concurrency(
+        admission_priority(), admission_timeout()
+    ):
+        response = requests.post(
+            "https://api.thebipartisanpress.com/api/endpoints/beta/robert",
+            data={"API": BIASAPI_KEY, "Text": article},
+            timeout=20,
+        )
     if response.ok:
         return {"value": float(response.content.decode("utf-8")) / 42}
     else:
@@ -246,11 +470,14 @@ def request_biasapi_mock(article: str) -> Union[BiasAnalysisSuccess, BiasAnalysi
     return {"value": (abs(hash(article)) % 100) / 50.0 - 1.0}
 
 
+@timed_stage("sentiment")
 @cache.memoize(CACHE_DEFAULT_TIMEOUT)
 def request_sentimentapi(
     article: str,
 ) -> Union[SentimentAnalysisSuccess, SentimentAnalysisError]:
-    result = sentiment_analysis_per_document(article)
+    result = sentence_sentiment_analysis_per_document(
+        article, app.config["SENTIMENT_MAX_ANALYZED_LENGTH"]
+    )
     return {
         "value": {
             "kind": "positive"
@@ -264,14 +491,67 @@ def request_sentimentapi(
 
 
 @cache.memoize(CACHE_DEFAULT_TIMEOUT)
-def _request_similarityapi(base_article: str, target_article: str) -> float:
-    return process_tfidf_similarity(base_article, target_article)
+def _tokenize_base_article(base_article: str) -> Counter[str]:
+    return tokenize_document(base_article)
 
 
+def document_key(document: str) -> str:
+    return hashlib.blake2b(document.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def similarity_key(base_article: str, article: str) -> str:
+    return f"similarity:{document_key(base_article)}:{document_key(article)}"
+
+
+@timed_stage("similarity")
 def request_similarityapi(
     base_article: str, article: str, threshold: float
 ) -> Union[SimilarityAnalysisSuccess, SimilarityAnalysisError]:
-    return {"is_similar": _request_similarityapi(base_article, article) > threshold}
+    # Scores are cached without the threshold so any threshold can reuse them
+    key = similarity_key(base_article, article)
+    score = cache.get(key)
+    if score is None:
+        base_counts = _tokenize_base_article(base_article)
+        tokens = tokenize_words(article)
+        pruned_by = candidate_pruner.prune(base_counts, tokens, threshold)
+        if pruned_by == "overlap":
+            # No shared token means the score is exactly 0 for any threshold
+            score = 0.0
+        elif pruned_by is not None:
+            # The bound is not a score, so there is nothing to cache
+            return {"is_similar": False, "score": None}
+        else:
+            score = process_tfidf_similarity_from_counts(base_counts, Counter(tokens))
+        cache.set(key, score)
+    return {"is_similar": score > threshold, "score": score}
+
+
+def encode_cursor(keyword: str, base_article: str, position: SearchPosition) -> str:
+    cursor: SearchCursor = {
+        "q": keyword,
+        "base": document_key(base_article),
+        "page": position["page"],
+        "position": position["position"],
+    }
+    # Follow-up requests may omit the content and resume from the cached article
+    cache.set(f"base-article:{cursor['base']}", base_article)
+    return base64.urlsafe_b64encode(json.dumps(cursor).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(encoded: str) -> SearchCursor:
+    try:
+        cursor = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+        if not (
+            isinstance(cursor["q"], str)
+            and isinstance(cursor["base"], str)
+            and (cursor["page"] is None or type(cursor["page"]) in (int, str))
+            and type(cursor["position"]) is int
+            and cursor["position"] >= 0
+        ):
+            raise ValueError
+        return cast(SearchCursor, cursor)
+    except (AttributeError, KeyError, TypeError, ValueError, binascii.Error) as e:
+        raise ValueError("invalid continuation") from e
 
 
 def analyze_sentiment_and_bias(
@@ -340,45 +620,65 @@ def search_news_with_filter(
     sentiment_labels: list[SentimentLabel],
     similarity_threshold: float,
     base_article: str,
+    deadline: float,
+    page_budget: int,
+    start_position: int,
 ) -> Union[SearchWithSentimentSuccess, SearchError]:
-    collected_news: list[NewsWithSentiment] = []
-    while len(collected_news) < count:
-        result = call_newsapi(params, 10, False)
-        if "news" in result:
-            result = cast(SearchSuccess, result)
-            collected_news.extend(
-                [
-                    cast(
-                        NewsWithSentiment,
-                        cast(dict, news)
-                        | {
-                            "sentiment": cast(
-                                dict, call_sentimentapi(news["content"])["value"]
-                            )
-                        },
-                    )
-                    for news in result["news"]
-                    if cast(
-                        SimilarityAnalysisSuccess,
-                        call_similarityapi(
-                            base_article, news["content"], similarity_threshold
-                        ),
-                    )["is_similar"]
-                    and cast(
-                        SentimentAnalysisSuccess, call_sentimentapi(news["content"])
-                    )["value"]["kind"]
-                    in sentiment_labels
-                    and news["content"] != base_article
-                ]
+    collected_news: list[CompactNews] = []
+    page_count = 0
+    next_position: Optional[SearchPosition] = {
+        "page": params["page"],
+        "position": start_position,
+    }
+    while next_position is not None and len(collected_news) < count:
+        if page_count >= page_budget or time.monotonic() >= deadline:
+            break
+        page = next_position["page"]
+        position = next_position["position"]
+        # call_newsapi advances params["page"] while paging upstream
+        params["page"] = page
+        # Asking for one article fetches a single upstream page unless it has
+        # nothing usable; the budget counts the upstream pages actually fetched
+        try:
+            result = call_newsapi(params, 1, False)
+        except Overloaded:
+            if not collected_news and time.monotonic() < deadline:
+                # Nothing to return yet: let shed_request answer with Retry-After
+                raise
+            # Keep the matches found so far; the cursor resumes at this page
+            break
+        if "news" not in result:
+            return cast(SearchError, result)
+        result = cast(SearchSuccess, result)
+        page_count += result["pageCount"]
+        for news in result["news"][position:]:
+            position += 1
+            if news.content == base_article:
+                continue
+            similarity = cast(
+                SimilarityAnalysisSuccess,
+                call_similarityapi(base_article, news.content, similarity_threshold),
             )
-            if result["nextOffset"] is None:
+            if similarity["is_similar"]:
+                sentiment = cast(
+                    SentimentAnalysisSuccess, call_sentimentapi(news.content)
+                )["value"]
+                if sentiment["kind"] in sentiment_labels:
+                    collected_news.append(
+                        news.with_sentiment(sentiment, similarity["score"])
+                    )
+            if len(collected_news) >= count or time.monotonic() >= deadline:
                 break
-            params["page"] = result["nextOffset"]
+        if position < len(result["news"]):
+            next_position = {"page": page, "position": position}
+        elif result["nextOffset"] is None:
+            next_position = None
         else:
-            return cast(SearchError, result)
+            next_position = {"page": result["nextOffset"], "position": 0}
     return {
-        "news": collected_news[:count],
-        "nextOffset": cast(SearchSuccess, result)["nextOffset"],
+        "news": collected_news,
+        "nextPosition": next_position,
+        "partial": next_position is not None and len(collected_news) < count,
     }
 
 
@@ -502,12 +802,28 @@ def search_with_filters() -> tuple[
         return {
             "message": f"string decode error: {e.reason}"
         }, http.HTTPStatus.BAD_REQUEST
+    try:
+        cursor = (
+            decode_cursor(request_content["continuation"])
+            if request_content.get("continuation") is not None
+            else None
+        )
+    except ValueError as e:
+        return {"message": str(e)}, http.HTTPStatus.BAD_REQUEST
     try:
         article = request_content["content"]
     except KeyError as e:
-        return {"message": "key not found: content"}, http.HTTPStatus.BAD_REQUEST
+        article = (
+            None if cursor is None else cache.get(f"base-article:{cursor['base']}")
+        )
+        if article is None:
+            return {"message": "key not found: content"}, http.HTTPStatus.BAD_REQUEST
+    if cursor is not None and document_key(article) != cursor["base"]:
+        return {
+            "message": "continuation does not belong to this content"
+        }, http.HTTPStatus.BAD_REQUEST
     try:
-        keyword = request_content["keyword"]
+        keyword = cursor["q"] if cursor is not None else request_content["keyword"]
     except KeyError as e:
         return {"message": "key not found: keyword"}, http.HTTPStatus.BAD_REQUEST
     try:
@@ -540,8 +856,26 @@ def search_with_filters() -> tuple[
         }, http.HTTPStatus.BAD_REQUEST
     except ValueError as e:
         return {"message": str(e)}, http.HTTPStatus.BAD_REQUEST
+    try:
+        deadline = float(request_content.get("deadline", app.config["SEARCH_DEADLINE"]))
+        # NaN fails every comparison, so such a deadline would never expire
+        if not math.isfinite(deadline) or deadline <= 0:
+            raise ValueError("deadline must be a finite number > 0")
+        deadline = min(deadline, app.config["SEARCH_DEADLINE_LIMIT"])
+        page_budget = min(
+            int(request_content.get("pageBudget", app.config["SEARCH_PAGE_BUDGET"])),
+            app.config["SEARCH_PAGE_BUDGET_LIMIT"],
+        )
+        if page_budget < 1:
+            raise ValueError("pageBudget must be >= 1")
+    except (TypeError, ValueError) as e:
+        return {"message": str(e)}, http.HTTPStatus.BAD_REQUEST
+    g.request_deadline = g.request_started_at + deadline
+    include_similarity = request_content.get("includeSimilarity", False) is True
     search_result = search_news_with_filter(
-        generate_newsdataapi_param(keyword, language="en"),
+        generate_newsdataapi_param(
+            keyword, language="en", page=None if cursor is None else cursor["page"]
+        ),
         count,
         request_newsdataapi,
         request_sentimentapi,
@@ -549,6 +883,9 @@ def search_with_filters() -> tuple[
         sentiment_filter,
         similarity_threshold,
         article,
+        g.request_deadline,
+        page_budget,
+        0 if cursor is None else cursor["position"],
     )
     if "news" not in search_result:
         search_result = cast(SearchError, search_result)
@@ -558,10 +895,27 @@ def search_with_filters() -> tuple[
             "debug": "",
         }, http.HTTPStatus.INTERNAL_SERVER_ERROR
     search_result = cast(SearchWithSentimentSuccess, search_result)
+    next_continuation = (
+        None
+        if search_result["nextPosition"] is None
+        else encode_cursor(keyword, article, search_result["nextPosition"])
+    )
+    if search_result["partial"] and not search_result["news"]:
+        return {
+            "reason": "search budget exhausted before any match was found",
+            "continuation": next_continuation,
+        }, http.HTTPStatus.GATEWAY_TIMEOUT
 
     return {
-        "results": search_result["news"],
+        "results": [
+            news.to_news_with_sentiment_and_similarity()
+            if include_similarity
+            else news.to_news_with_sentiment()
+            for news in search_result["news"]
+        ],
         "count": len(search_result["news"]),
+        "partial": search_result["partial"],
+        "continuation": next_continuation,
     }, http.HTTPStatus.OK
 
 
@@ -593,7 +947,7 @@ def search() -> tuple[
     if "news" in search_result:
         search_result = cast(SearchSuccess, search_result)
         return {
-            "results": search_result["news"],
+            "results": [news.to_news() for news in search_result["news"]],
             "count": len(search_result["news"]),
             "nextOffset": search_result["nextOffset"],
         }, http.HTTPStatus.OK
@@ -603,3 +957,14 @@ def search() -> tuple[
         f"with message {search_result['message']}",
         "debug": "",
     }, http.HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+@app.route("/metrics", methods=["GET"])
+def get_metrics() -> tuple[MetricsOkResponse, int]:
+    limiters = [server_limiter, *route_limiters.values(), *upstream_limiters.values()]
+    return {
+        "admission": {
+            limiter.name: cast(AdmissionStats, limiter.stats()) for limiter in limiters
+        },
+        "pruning": cast(dict[str, PruningStats], candidate_pruner.stats()),
+    }, http.HTTPStatus.OK
@@ -0,0 +1,83 @@
+"""Compare the cached size of fetched pages as dicts and as CompactNewsPage.
+
+SimpleCache stores every entry as pickled bytes, so this measures exactly what
+the cache holds for each layout. Run from the repository root:
+
+    python -m benchmarks.cache_footprint [pages]
+"""
+import random
+import sys
+from typing import Any, cast
+
+from cachelib import SimpleCache
+
+from data_types import CompactNews, CompactNewsPage, News
+
+PAGE_SIZE = 10
+WORDS = (
+    "the of and to in a is that for on with as was by at market bank rates "
+    "economy government policy report said inflation election court climate "
+    "energy prices growth workers company shares percent officials minister"
+).split()
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(WORDS, k=words))
+
+
+def _raw_page(rng: random.Random, page: int) -> list[dict]:
+    return [
+        {
+            "source": f"source{rng.randrange(50)}",
+            "author": f"Author {rng.randrange(200)}",
+            "title": _text(rng, rng.randint(6, 14)).capitalize(),
+            "content": _text(rng, rng.randint(30, 250)).capitalize() + ".",
+            "url": f"https://news{rng.randrange(50)}.example.com/{page}/{i}",
+            "url_to_image": rng.choice(
+                [None, f"https://cdn.example.com/{page}/{i}.jpg"]
+            ),
+            "published_at": f"2022-11-{rng.randint(1, 30):02} 10:00:00",
+        }
+        for i in range(PAGE_SIZE)
+    ]
+
+
+def _to_news(raw: dict) -> News:
+    return {
+        "source": raw["source"],
+        "author": raw["author"],
+        "title": raw["title"],
+        "content": raw["content"],
+        "url": raw["url"],
+        "urlToImage": raw["url_to_image"],
+        "publishedAt": raw["published_at"],
+    }
+
+
+def _cached_bytes(value: Any) -> int:
+    # The same serializer SimpleCache applies before storing an entry
+    return len(cast(bytes, SimpleCache().serializer.dumps(value)))
+
+
+def main(pages: int) -> None:
+    rng = random.Random(0)
+    dict_bytes = page_bytes = 0
+    for page in range(pages):
+        raw_page = _raw_page(rng, page)
+        dict_bytes += _cached_bytes(
+            {"news": [_to_news(raw) for raw in raw_page], "nextOffset": page + 1}
+        )
+        page_bytes += _cached_bytes(
+            {
+                "news": CompactNewsPage(CompactNews(**raw) for raw in raw_page),
+                "nextOffset": page + 1,
+            }
+        )
+    print(f"pages:           {pages} x {PAGE_SIZE} articles")
+    print(f"list of dicts:   {dict_bytes} bytes ({dict_bytes / pages:.0f} per page)")
+    print(f"CompactNewsPage: {page_bytes} bytes ({page_bytes / pages:.0f} per page)")
+    print(f"saved:           {1 - page_bytes / dict_bytes:.1%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -1,4 +1,15 @@
-from typing import Literal, Optional, TypedDict
+import sys
+from typing import (
+    Any,
+    Iterable,
+    Iterator,
+    Literal,
+    Optional,
+    TypedDict,
+    Union,
+    cast,
+    overload,
+)
 
 
 class OppositeNewsRequest(TypedDict):
@@ -21,6 +32,7 @@ class InternalErrorResponse(TypedDict):
 
 class GatewayTimeoutResponse(TypedDict):
     reason: str
+    continuation: Optional[str]
 
 
 SentimentLabel = Literal["positive", "neutral", "negative"]
@@ -53,6 +65,231 @@ class NewsWithSentiment(TypedDict):
     sentiment: Sentiment
 
 
+class NewsWithSentimentAndSimilarity(TypedDict):
+    source: str
+    author: Optional[str]
+    title: str
+    description: str
+    content: str
+    url: str
+    urlToImage: Optional[str]
+    publishedAt: Optional[str]
+    sentiment: Sentiment
+    similarity: float
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class CompactNews:
+    """Slotted article record passed through filtering and analysis.
+
+    Fetched pages are cached as ``CompactNewsPage`` and yield these records.
+    Source and author strings are interned so the records alive in one process,
+    such as the matches a scan collects, share them. Convert to the JSON
+    ``News`` shape only when building a response.
+    """
+
+    __slots__ = (
+        "source",
+        "author",
+        "title",
+        "content",
+        "url",
+        "url_to_image",
+        "published_at",
+        "sentiment_kind",
+        "sentiment_confidence",
+        "similarity",
+    )
+
+    def __init__(
+        self,
+        source: Optional[str],
+        author: Optional[str],
+        title: str,
+        content: str,
+        url: str,
+        url_to_image: Optional[str],
+        published_at: Optional[str],
+        sentiment_kind: Optional[SentimentLabel] = None,
+        sentiment_confidence: Optional[float] = None,
+        similarity: Optional[float] = None,
+    ) -> None:
+        self.source = _intern(source)
+        self.author = _intern(author)
+        self.title = title
+        self.content = content
+        self.url = url
+        self.url_to_image = url_to_image
+        self.published_at = published_at
+        self.sentiment_kind = _intern(sentiment_kind)
+        self.sentiment_confidence = sentiment_confidence
+        self.similarity = similarity
+
+    def __reduce__(self) -> tuple:
+        # Rebuild through __init__ so strings are re-interned after unpickling
+        return (
+            CompactNews,
+            (
+                self.source,
+                self.author,
+                self.title,
+                self.content,
+                self.url,
+                self.url_to_image,
+                self.published_at,
+                self.sentiment_kind,
+                self.sentiment_confidence,
+                self.similarity,
+            ),
+        )
+
+    def with_sentiment(
+        self, sentiment: Sentiment, similarity: Optional[float] = None
+    ) -> "CompactNews":
+        return CompactNews(
+            self.source,
+            self.author,
+            self.title,
+            self.content,
+            self.url,
+            self.url_to_image,
+            self.published_at,
+            sentiment["kind"],
+            sentiment["confidence"],
+            similarity,
+        )
+
+    def to_news(self) -> News:
+        return {
+            "source": self.source,
+            "author": self.author,
+            "title": self.title,
+            "content": self.content,
+            "url": self.url,
+            "urlToImage": self.url_to_image,
+            "publishedAt": self.published_at,
+        }
+
+    def to_news_with_sentiment(self) -> NewsWithSentiment:
+        return cast(
+            NewsWithSentiment,
+            cast(dict, self.to_news())
+            | {
+                "sentiment": {
+                    "kind": self.sentiment_kind,
+                    "confidence": self.sentiment_confidence,
+                }
+            },
+        )
+
+    def to_news_with_sentiment_and_similarity(self) -> NewsWithSentimentAndSimilarity:
+        return cast(
+            NewsWithSentimentAndSimilarity,
+            cast(dict, self.to_news_with_sentiment()) | {"similarity": self.similarity},
+        )
+
+
+class CompactNewsPage:
+    """Columnar page of fetched articles, the unit stored in the result cache.
+
+    The cache stores each page as its own pickled bytes, so nothing is shared
+    between entries and every read unpickles a whole page. Articles are stored
+    as one list per field instead of one object each, and sources and authors
+    are kept once in per-page tables referenced by index. See
+    ``benchmarks/cache_footprint.py`` for the cached size against plain dicts.
+    """
+
+    __slots__ = (
+        "sources",
+        "authors",
+        "source_indexes",
+        "author_indexes",
+        "titles",
+        "contents",
+        "urls",
+        "url_to_images",
+        "published_ats",
+    )
+
+    def __init__(self, news: Iterable[CompactNews] = ()) -> None:
+        self.sources: list[Any] = []
+        self.authors: list[Optional[str]] = []
+        self.source_indexes: list[int] = []
+        self.author_indexes: list[int] = []
+        self.titles: list[str] = []
+        self.contents: list[str] = []
+        self.urls: list[str] = []
+        self.url_to_images: list[Optional[str]] = []
+        self.published_ats: list[Optional[str]] = []
+        for item in news:
+            self.append(item)
+
+    def append(self, news: CompactNews) -> None:
+        self.source_indexes.append(_table_index(self.sources, news.source))
+        self.author_indexes.append(_table_index(self.authors, news.author))
+        self.titles.append(news.title)
+        self.contents.append(news.content)
+        self.urls.append(news.url)
+        self.url_to_images.append(news.url_to_image)
+        self.published_ats.append(news.published_at)
+
+    def __reduce__(self) -> tuple:
+        # Pickle the bare columns; the default slot state repeats every slot name
+        return (
+            _restore_page,
+            tuple(getattr(self, name) for name in CompactNewsPage.__slots__),
+        )
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    @overload
+    def __getitem__(self, index: int) -> CompactNews:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[CompactNews]:
+        ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[CompactNews, list[CompactNews]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return CompactNews(
+            self.sources[self.source_indexes[index]],
+            self.authors[self.author_indexes[index]],
+            self.titles[index],
+            self.contents[index],
+            self.urls[index],
+            self.url_to_images[index],
+            self.published_ats[index],
+        )
+
+    def __iter__(self) -> Iterator[CompactNews]:
+        return (self[i] for i in range(len(self)))
+
+
+def _restore_page(*columns: list) -> CompactNewsPage:
+    page = CompactNewsPage()
+    for name, column in zip(CompactNewsPage.__slots__, columns):
+        setattr(page, name, column)
+    return page
+
+
+def _table_index(table: list, value: Any) -> int:
+    # Pages hold about ten articles, so a linear scan beats a lookup dict and
+    # also copes with unhashable values such as NewsAPI source objects
+    for index, existing in enumerate(table):
+        if existing == value:
+            return index
+    table.append(value)
+    return len(table) - 1
+
+
 class NewsWithSentimentAndBias(TypedDict):
     source: str
     author: Optional[str]
@@ -74,7 +311,9 @@ class SearchOkResponse(TypedDict):
 
 class SearchWithFilterOkResponse(TypedDict):
     count: int
-    results: list[NewsWithSentiment]
+    results: list[Union[NewsWithSentiment, NewsWithSentimentAndSimilarity]]
+    partial: bool
+    continuation: Optional[str]
 
 
 class SentimentAndBiasOkResponse(TypedDict):
@@ -115,13 +354,28 @@ class NewsApiParam(TypedDict):
 
 
 class SearchSuccess(TypedDict):
-    news: list[News]
+    news: CompactNewsPage
     nextOffset: Optional[int]
+    # Upstream pages fetched to build this result
+    pageCount: int
+
+
+class SearchPosition(TypedDict):
+    page: Optional[int]
+    position: int
+
+
+class SearchCursor(TypedDict):
+    q: str
+    base: str
+    page: Optional[int]
+    position: int
 
 
 class SearchWithSentimentSuccess(TypedDict):
-    news: list[NewsWithSentiment]
-    nextOffset: Optional[int]
+    news: list[CompactNews]
+    nextPosition: Optional[SearchPosition]
+    partial: bool
 
 
 class SearchError(TypedDict):
@@ -161,6 +415,7 @@ class SentimentAnalysisError(TypedDict):
 
 class SimilarityAnalysisSuccess(TypedDict):
     is_similar: bool
+    score: Optional[float]  # None when the candidate was pruned before scoring
 
 
 class SimilarityAnalysisError(TypedDict):
@@ -168,6 +423,24 @@ class SimilarityAnalysisError(TypedDict):
     message: str
 
 
+class AdmissionStats(TypedDict):
+    limit: int
+    active: int
+    queued: int
+    shed: int
+
+
+class PruningStats(TypedDict):
+    entered: int
+    pruned: int
+    rate: float
+
+
+class MetricsOkResponse(TypedDict):
+    admission: dict[str, AdmissionStats]
+    pruning: dict[str, PruningStats]
+
+
 class SentimentAnalysisResult(TypedDict):
     status_code: int
     value: Sentiment
@@ -0,0 +1,94 @@
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+
+class Overloaded(Exception):
+    def __init__(self, name: str, status_code: int, retry_after: int) -> None:
+        super().__init__(f"{name} is saturated")
+        self.name = name
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class AdmissionLimiter:
+    """Concurrency limit with a bounded wait queue served by priority.
+
+    Callers with a lower priority value are admitted first; callers that
+    cannot be queued, or wait longer than ``timeout`` seconds (or the shorter
+    timeout they pass in), are shed with ``Overloaded``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limit: int,
+        max_queue: int,
+        timeout: float,
+        status_code: int,
+        retry_after: int,
+    ) -> None:
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.active = 0
+        self.shed_count = 0
+        self._waiting: list[tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+
+    def acquire(self, priority: int = 0, timeout: Optional[float] = None) -> None:
+        with self._condition:
+            if self.active < self.limit and not self._waiting:
+                self.active += 1
+                return
+            if len(self._waiting) >= self.max_queue:
+                self.shed_count += 1
+                raise Overloaded(self.name, self.status_code, self.retry_after)
+            entry = (priority, next(self._sequence))
+            heapq.heappush(self._waiting, entry)
+            deadline = time.monotonic() + (
+                self.timeout if timeout is None else min(self.timeout, timeout)
+            )
+            while not (self.active < self.limit and self._waiting[0] == entry):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._waiting.remove(entry)
+                    heapq.heapify(self._waiting)
+                    self.shed_count += 1
+                    self._condition.notify_all()
+                    raise Overloaded(self.name, self.status_code, self.retry_after)
+                self._condition.wait(remaining)
+            heapq.heappop(self._waiting)
+            self.active += 1
+            self._condition.notify_all()
+
+    def release(self) -> None:
+        with self._condition:
+            self.active -= 1
+            self._condition.notify_all()
+
+    @contextmanager
+    def limit_concurrency(
+        self, priority: int = 0, timeout: Optional[float] = None
+    ) -> Iterator[None]:
+        self.acquire(priority, timeout)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> dict[str, int]:
+        with self._condition:
+            return {
+                "limit": self.limit,
+                "active": self.active,
+                "queued": len(self._waiting),
+                "shed": self.shed_count,
+            }
@@ -0,0 +1,83 @@
+import math
+import threading
+from collections import Counter
+from typing import Optional
+
+PRUNING_STAGES = ("overlap", "bound")
+
+# Smoothed idf of a term found in only one of the two documents, as in
+# process_tfidf_similarity_from_counts; shared terms get idf 1
+_UNIQUE_IDF = math.log(3 / 2) + 1
+# Slack for rounding between the bound and the score computed term by term
+_BOUND_EPSILON = 1e-9
+
+
+class CandidatePruner:
+    """Cheap checks that drop candidates before their term counts are built.
+
+    The checks run on the candidate's token list, so a pruned candidate never
+    pays for counting or scoring. Both stages are exact: they only prune a
+    candidate whose score cannot exceed the similarity threshold.
+
+    "overlap" prunes candidates without a shared token, whose score is 0.
+    "bound" prunes with the Cauchy–Schwarz bound on the cosine score: the dot
+    product only sums over shared terms, so the score is at most the base
+    article's weight on the shared terms over its norm, sqrt(S) / ||b||.
+    """
+
+    def __init__(self) -> None:
+        self.entered: Counter[str] = Counter()
+        self.pruned: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def score_bound(base_counts: Counter[str], tokens: list[str]) -> float:
+        """Upper bound of the candidate's tfidf similarity score."""
+        shared = sum(base_counts[term] ** 2 for term in base_counts.keys() & tokens)
+        total = sum(count**2 for count in base_counts.values())
+        base_norm = math.sqrt(shared + _UNIQUE_IDF**2 * (total - shared))
+        return math.sqrt(shared) / base_norm if base_norm else 0.0
+
+    def prune(
+        self,
+        base_counts: Counter[str],
+        tokens: list[str],
+        similarity_threshold: float,
+    ) -> Optional[str]:
+        """Return the stage that pruned the candidate, or None if it survived.
+
+        ``tokens`` are the candidate's tokens as returned by ``tokenize_words``.
+        """
+        if similarity_threshold < 0:
+            # Even a score of 0 passes, so nothing can be pruned
+            return None
+        checks = (
+            ("overlap", lambda: base_counts.keys().isdisjoint(tokens)),
+            (
+                "bound",
+                lambda: self.score_bound(base_counts, tokens)
+                <= similarity_threshold - _BOUND_EPSILON,
+            ),
+        )
+        for stage, is_pruned in checks:
+            pruned = is_pruned()
+            with self._lock:
+                self.entered[stage] += 1
+                if pruned:
+                    self.pruned[stage] += 1
+            if pruned:
+                return stage
+        return None
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            return {
+                stage: {
+                    "entered": self.entered[stage],
+                    "pruned": self.pruned[stage],
+                    "rate": self.pruned[stage] / self.entered[stage]
+                    if self.entered[stage]
+                    else 0.0,
+                }
+                for stage in PRUNING_STAGES
+            }
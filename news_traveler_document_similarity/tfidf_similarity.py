@@ -1,6 +1,19 @@
+import math
+from collections import Counter
+
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
+_analyzer = TfidfVectorizer().build_analyzer()
+# Maps ASCII bytes the token pattern counts as word characters to themselves
+# and every other byte to a space
+_WORD_BYTES = bytes(
+    c if c < 128 and (chr(c).isalnum() or chr(c) == "_") else ord(" ")
+    for c in range(256)
+)
+# Typographic punctuation common in news text, none of it word characters
+_SEPARATORS = "\u00a0\u2018\u2019\u201c\u201d\u2013\u2014\u2026"
+
 
 def process_tfidf_similarity(base_document: str, document_to_compare: str) -> float:
     tfidf_vectorizer = TfidfVectorizer()
@@ -10,3 +23,55 @@ def process_tfidf_similarity(base_document: str, document_to_compare: str) -> fl
     cos_similarity = cosine_similarity(tfidf_matrix[0], tfidf_matrix[1])
 
     return cos_similarity
+
+
+def tokenize_words(document: str) -> list[str]:
+    """Same tokens as the TF-IDF analyzer, without its regex pass for plain text.
+
+    Once typographic punctuation is blanked out most news text is ASCII, where
+    a byte translation reproduces the ``\\b\\w\\w+\\b`` token pattern exactly.
+    Anything else goes through the analyzer.
+    """
+    text = document.lower()
+    if not text.isascii():
+        for separator in _SEPARATORS:
+            text = text.replace(separator, " ")
+        if not text.isascii():
+            return _analyzer(document)
+    words = text.encode("ascii").translate(_WORD_BYTES).decode("ascii").split()
+    return [word for word in words if len(word) > 1]
+
+
+def tokenize_document(document: str) -> Counter[str]:
+    return Counter(tokenize_words(document))
+
+
+def process_tfidf_similarity_from_counts(
+    base_counts: Counter[str], counts_to_compare: Counter[str]
+) -> float:
+    """Same score as process_tfidf_similarity, computed from term counts.
+
+    With the vectorizer fitted on just the two documents, a term shared by both
+    gets idf 1 and any other term ln(3 / 2) + 1 (smoothed idf), so the base
+    article's counts can be tokenized once and reused for every candidate.
+    """
+    unique_idf = math.log(3 / 2) + 1
+
+    def norm(counts: Counter[str], other: Counter[str]) -> float:
+        return math.sqrt(
+            sum(
+                (count * (1.0 if term in other else unique_idf)) ** 2
+                for term, count in counts.items()
+            )
+        )
+
+    base_norm = norm(base_counts, counts_to_compare)
+    norm_to_compare = norm(counts_to_compare, base_counts)
+    if base_norm == 0 or norm_to_compare == 0:
+        return 0.0
+    dot = sum(
+        count * counts_to_compare[term]
+        for term, count in base_counts.items()
+        if term in counts_to_compare
+    )
+    return dot / (base_norm * norm_to_compare)
@@ -0,0 +1,94 @@
+import json
+import sys
+import threading
+from collections import Counter
+from typing import Optional
+
+Frame = tuple[str, str, int]  # function name, file, first line
+
+
+class SamplingProfiler:
+    """Periodically samples the call stack of the thread that started it.
+
+    Samples are written either as collapsed stacks (flamegraph.pl, speedscope
+    import) or as a speedscope "sampled" profile.
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self.samples: Counter[tuple[Frame, ...]] = Counter()
+        self._thread_id = 0
+        self._sampler: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def __enter__(self) -> "SamplingProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._thread_id = threading.get_ident()
+        self._stopped.clear()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+
+    def _sample(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack: list[Frame] = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            if stack:
+                self.samples[tuple(reversed(stack))] += 1
+
+    def write_collapsed(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.samples.items():
+                names = ";".join(
+                    f"{name} ({file}:{line})" for name, file, line in stack
+                )
+                f.write(f"{names} {count}\n")
+
+    def write_speedscope(self, path: str, name: str) -> None:
+        frame_indexes: dict[Frame, int] = {}
+        samples = []
+        weights = []
+        for stack, count in self.samples.items():
+            samples.append(
+                [frame_indexes.setdefault(frame, len(frame_indexes)) for frame in stack]
+            )
+            weights.append(count * self.interval)
+        profile = {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "news-traveler-server",
+            "shared": {
+                "frames": [
+                    {"name": frame_name, "file": file, "line": line}
+                    for frame_name, file, line in frame_indexes
+                ]
+            },
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(profile, f)
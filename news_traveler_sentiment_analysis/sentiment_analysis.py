@@ -1,6 +1,25 @@
+import hashlib
+from collections import OrderedDict
+from importlib.metadata import PackageNotFoundError, version
 from multiprocessing import Pool, cpu_count
+from threading import Lock
+from typing import Final, Optional
 
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from vaderSentiment.vaderSentiment import (
+    BOOSTER_DICT,
+    SentimentIntensityAnalyzer,
+    SentiText,
+    allcap_differential,
+)
+
+SENTENCE_CACHE_SIZE: Final = 100_000
+SENTENCE_TERMINATORS: Final = (".", "!", "?")
+CONTEXT_BEFORE: Final = 3
+CONTEXT_AFTER: Final = 2
+
+_analyzer: Optional[SentimentIntensityAnalyzer] = None
+_sentence_valences: OrderedDict[bytes, tuple[float, ...]] = OrderedDict()
+_sentence_valences_lock = Lock()
 
 
 def process_sentiment_analysis(documents: list) -> list:
@@ -9,11 +28,7 @@ def process_sentiment_analysis(documents: list) -> list:
     return results
 
 
-def sentiment_analysis_per_document(document: str) -> dict:
-    sid_obj = SentimentIntensityAnalyzer()
-
-    sentiment_dict = sid_obj.polarity_scores(document)
-
+def _label_sentiment(sentiment_dict: dict) -> dict:
     result = {}
 
     if sentiment_dict["compound"] >= 0.05:
@@ -27,3 +42,170 @@ def sentiment_analysis_per_document(document: str) -> dict:
         result["score"] = sentiment_dict["neu"]
 
     return result
+
+
+def sentiment_analysis_per_document(document: str) -> dict:
+    sid_obj = SentimentIntensityAnalyzer()
+
+    sentiment_dict = sid_obj.polarity_scores(document)
+
+    return _label_sentiment(sentiment_dict)
+
+
+def _vader_version() -> Optional[str]:
+    try:
+        return version("vaderSentiment")
+    except PackageNotFoundError:
+        return None
+
+
+# Sentence mode re-implements the scoring loop of polarity_scores on top of
+# private VADER helpers, verified against this release only
+VADER_INTERNALS_SUPPORTED: Final = _vader_version() == "3.3.2"
+
+
+def _get_analyzer() -> SentimentIntensityAnalyzer:
+    global _analyzer
+    if _analyzer is None:
+        _analyzer = SentimentIntensityAnalyzer()
+    return _analyzer
+
+
+def _replace_emojis(analyzer: SentimentIntensityAnalyzer, text: str) -> str:
+    # Same emoji translation as SentimentIntensityAnalyzer.polarity_scores
+    text_no_emoji = ""
+    prev_space = True
+    for character in text:
+        if character in analyzer.emojis:
+            if not prev_space:
+                text_no_emoji += " "
+            text_no_emoji += analyzer.emojis[character]
+            prev_space = False
+        else:
+            text_no_emoji += character
+            prev_space = character == " "
+    return text_no_emoji.strip()
+
+
+def _truncate(document: str, max_length: Optional[int]) -> str:
+    if max_length is None or len(document) <= max_length:
+        return document
+    truncated = document[:max_length]
+    if not document[max_length].isspace() and len(truncated.split()) > 1:
+        # Drop the word cut in half by the limit
+        truncated = truncated.rsplit(maxsplit=1)[0]
+    return truncated
+
+
+def _split_sentences(tokens: list[str]) -> list[tuple[int, int]]:
+    sentences: list[tuple[int, int]] = []
+    start = 0
+    for end, token in enumerate(tokens, start=1):
+        if token.endswith(SENTENCE_TERMINATORS):
+            sentences.append((start, end))
+            start = end
+    if start < len(tokens):
+        sentences.append((start, len(tokens)))
+    return sentences
+
+
+def _score_words(
+    analyzer: SentimentIntensityAnalyzer,
+    tokens: list[str],
+    start: int,
+    end: int,
+    is_cap_diff: bool,
+) -> list[float]:
+    sentitext = SentiText(" ".join(tokens))
+    # ALL CAPS emphasis depends on the whole document, not on the sentence
+    sentitext.is_cap_diff = is_cap_diff
+    words_and_emoticons = sentitext.words_and_emoticons
+    sentiments: list[float] = []
+    for i in range(start, end):
+        item = words_and_emoticons[i]
+        if item.lower() in BOOSTER_DICT:
+            sentiments.append(0)
+            continue
+        if (
+            i < len(words_and_emoticons) - 1
+            and item.lower() == "kind"
+            and words_and_emoticons[i + 1].lower() == "of"
+        ):
+            sentiments.append(0)
+            continue
+        sentiments = analyzer.sentiment_valence(0, sentitext, item, i, sentiments)
+    return sentiments
+
+
+def _cached_sentence_valences(
+    analyzer: SentimentIntensityAnalyzer, sentence: list[str], is_cap_diff: bool
+) -> tuple[float, ...]:
+    # Scored on its own, so the same sentence is reused across documents
+    key = hashlib.blake2b(
+        f"{int(is_cap_diff)}\0{' '.join(sentence)}".encode("utf-8"), digest_size=16
+    ).digest()
+    with _sentence_valences_lock:
+        valences = _sentence_valences.get(key)
+        if valences is not None:
+            _sentence_valences.move_to_end(key)
+            return valences
+    valences = tuple(_score_words(analyzer, sentence, 0, len(sentence), is_cap_diff))
+    with _sentence_valences_lock:
+        _sentence_valences[key] = valences
+        if len(_sentence_valences) > SENTENCE_CACHE_SIZE:
+            _sentence_valences.popitem(last=False)
+    return valences
+
+
+def _boundary_positions(start: int, end: int, length: int) -> list[int]:
+    # VADER looks up to CONTEXT_BEFORE words back and CONTEXT_AFTER words ahead,
+    # so only these words of a sentence can depend on its neighbours
+    positions: set[int] = set()
+    if start > 0:
+        positions.update(range(start, min(start + CONTEXT_BEFORE, end)))
+    if end < length:
+        positions.update(range(max(end - CONTEXT_AFTER, start), end))
+    return sorted(positions)
+
+
+def sentence_sentiment_analysis_per_document(
+    document: str, max_length: Optional[int] = None
+) -> dict:
+    """Score a document sentence by sentence, reusing cached sentence valences.
+
+    Word valences are cached per whitespace-normalized sentence, independent of
+    the surrounding text. The few words at each sentence edge that VADER scores
+    against neighbouring sentences are rescored in place, and everything is
+    combined exactly as VADER does for a whole document ("but" contrast,
+    punctuation emphasis, compound normalization), so the result matches
+    ``sentiment_analysis_per_document``. Only the first ``max_length``
+    characters are analyzed when set.
+    """
+    analyzer = _get_analyzer()
+    if not VADER_INTERNALS_SUPPORTED:
+        return _label_sentiment(
+            analyzer.polarity_scores(_truncate(document, max_length))
+        )
+    text = _replace_emojis(analyzer, _truncate(document, max_length))
+    tokens = text.split()
+    words_and_emoticons = [SentiText._strip_punc_if_word(token) for token in tokens]
+    is_cap_diff = allcap_differential(words_and_emoticons)
+
+    sentiments: list[float] = []
+    for start, end in _split_sentences(tokens):
+        valences = list(
+            _cached_sentence_valences(analyzer, tokens[start:end], is_cap_diff)
+        )
+        for i in _boundary_positions(start, end, len(tokens)):
+            window_start = max(i - CONTEXT_BEFORE, 0)
+            valences[i - start] = _score_words(
+                analyzer,
+                tokens[window_start : i + CONTEXT_AFTER + 1],
+                i - window_start,
+                i - window_start + 1,
+                is_cap_diff,
+            )[0]
+        sentiments.extend(valences)
+    sentiments = analyzer._but_check(words_and_emoticons, sentiments)
+
+    return _label_sentiment(analyzer.score_valence(sentiments, text))
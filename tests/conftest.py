@@ -0,0 +1,5 @@
+import os
+
+# app reads its API keys at import time
+os.environ.setdefault("NEWSAPI_KEY", "")
+os.environ.setdefault("BIASAPI_KEY", "")
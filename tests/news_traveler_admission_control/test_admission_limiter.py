@@ -0,0 +1,73 @@
+import threading
+import time
+
+import pytest
+
+from news_traveler_admission_control.admission_control import (
+    AdmissionLimiter,
+    Overloaded,
+)
+
+
+def make_limiter(max_queue=2, timeout=1.0):
+    return AdmissionLimiter(
+        "test",
+        limit=1,
+        max_queue=max_queue,
+        timeout=timeout,
+        status_code=503,
+        retry_after=3,
+    )
+
+
+def wait_until_queued(limiter, queued):
+    while limiter.stats()["queued"] < queued:
+        time.sleep(0.001)
+
+
+def test_admission_limiter_sheds_when_queue_is_full():
+    limiter = make_limiter(max_queue=0)
+    limiter.acquire()
+    with pytest.raises(Overloaded) as e:
+        limiter.acquire()
+    assert e.value.status_code == 503 and e.value.retry_after == 3
+    limiter.release()
+    assert limiter.stats() == {"limit": 1, "active": 0, "queued": 0, "shed": 1}
+
+
+def test_admission_limiter_sheds_after_timeout():
+    limiter = make_limiter(timeout=0.01)
+    limiter.acquire()
+    with pytest.raises(Overloaded):
+        limiter.acquire()
+    assert limiter.stats()["queued"] == 0
+
+
+def test_admission_limiter_caller_timeout_shortens_wait():
+    limiter = make_limiter(timeout=10.0)
+    limiter.acquire()
+    started_at = time.monotonic()
+    with pytest.raises(Overloaded):
+        limiter.acquire(timeout=0.01)
+    assert time.monotonic() - started_at < 1.0
+
+
+def test_admission_limiter_admits_by_priority():
+    limiter = make_limiter()
+    admitted = []
+
+    def worker(priority):
+        with limiter.limit_concurrency(priority):
+            admitted.append(priority)
+
+    limiter.acquire()
+    low = threading.Thread(target=worker, args=(1,))
+    low.start()
+    wait_until_queued(limiter, 1)
+    high = threading.Thread(target=worker, args=(0,))
+    high.start()
+    wait_until_queued(limiter, 2)
+    limiter.release()
+    low.join()
+    high.join()
+    assert admitted == [0, 1]
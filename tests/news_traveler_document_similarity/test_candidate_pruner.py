@@ -0,0 +1,51 @@
+import random
+
+from news_traveler_document_similarity.candidate_pruning import CandidatePruner
+from news_traveler_document_similarity.tfidf_similarity import (
+    process_tfidf_similarity_from_counts,
+    tokenize_document,
+    tokenize_words,
+)
+
+BASE_DOCUMENT = "The central bank raised interest rates to fight inflation."
+CANDIDATES = [
+    "Interest rates were raised again by the central bank.",
+    "The bank opened a new branch downtown this week.",
+    "Football season opens with a surprise win.",
+    "Inflation.",
+    "Bank",
+    "",
+]
+
+
+def test_candidate_pruner_never_drops_a_match():
+    pruner = CandidatePruner()
+    base_counts = tokenize_document(BASE_DOCUMENT)
+    words = tokenize_words(BASE_DOCUMENT) + ["football", "season", "branch"]
+    rng = random.Random(0)
+    candidates = CANDIDATES + [
+        " ".join(rng.choices(words, k=rng.randint(1, 30))) for _ in range(200)
+    ]
+    for threshold in (0.0, 0.1, 0.3, 0.5, 0.9):
+        for candidate in candidates:
+            tokens = tokenize_words(candidate)
+            if pruner.prune(base_counts, tokens, threshold):
+                assert (
+                    process_tfidf_similarity_from_counts(
+                        base_counts, tokenize_document(candidate)
+                    )
+                    <= threshold
+                )
+    assert pruner.stats()["bound"]["pruned"] > 0
+
+
+def test_candidate_pruner_stages():
+    pruner = CandidatePruner()
+    base_counts = tokenize_document(BASE_DOCUMENT)
+    assert pruner.prune(base_counts, tokenize_words(CANDIDATES[2]), 0.1) == "overlap"
+    assert pruner.prune(base_counts, tokenize_words("Bank"), 0.5) == "bound"
+    assert pruner.prune(base_counts, tokenize_words(CANDIDATES[0]), 0.5) is None
+    assert pruner.prune(base_counts, tokenize_words(""), -1.0) is None
+    stats = pruner.stats()
+    assert stats["overlap"] == {"entered": 3, "pruned": 1, "rate": 1 / 3}
+    assert stats["bound"] == {"entered": 2, "pruned": 1, "rate": 0.5}
@@ -0,0 +1,34 @@
+import pytest
+
+from news_traveler_document_similarity.tfidf_similarity import (
+    process_tfidf_similarity,
+    process_tfidf_similarity_from_counts,
+    tokenize_document,
+)
+
+
+def test_process_tfidf_similarity_from_counts():
+    base_document = (
+        "Stock markets fell as the central bank raised interest rates again."
+    )
+    documents_to_compare = [
+        "The central bank raised rates, and stock markets fell sharply.",
+        "Interest rates: the bank, the bank and the BANK again.",
+        "A quiet weekend of football with no surprises.",
+    ]
+    base_counts = tokenize_document(base_document)
+    for document in documents_to_compare:
+        assert process_tfidf_similarity_from_counts(
+            base_counts, tokenize_document(document)
+        ) == pytest.approx(
+            float(process_tfidf_similarity(base_document, document)[0][0])
+        )
+
+
+def test_process_tfidf_similarity_from_counts_without_tokens():
+    assert (
+        process_tfidf_similarity_from_counts(
+            tokenize_document("a b c"), tokenize_document("news")
+        )
+        == 0.0
+    )
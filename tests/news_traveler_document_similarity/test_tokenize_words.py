@@ -0,0 +1,21 @@
+import random
+
+from news_traveler_document_similarity import tfidf_similarity
+from news_traveler_document_similarity.tfidf_similarity import tokenize_words
+
+
+def test_tokenize_words_matches_tfidf_analyzer():
+    documents = [
+        "The U.S.-China talks — “finally” — resumed… at 10:30am_local.",
+        "Café owners’ profits rose 5%; a I x_y __ 2022-11-01",
+        "Ünïcode TEXT falls back to the analyzer",
+        "",
+    ]
+    rng = random.Random(0)
+    alphabet = "aZ_9 .,'’—\t\né$%&()[]:;\"K…\x1c "
+    documents += [
+        "".join(rng.choice(alphabet) for _ in range(rng.randrange(40)))
+        for _ in range(2000)
+    ]
+    for document in documents:
+        assert tokenize_words(document) == tfidf_similarity._analyzer(document)
@@ -0,0 +1,31 @@
+import json
+import time
+
+from news_traveler_profiling.sampling_profiler import SamplingProfiler
+
+
+def busy_wait(seconds: float) -> None:
+    until = time.perf_counter() + seconds
+    while time.perf_counter() < until:
+        pass
+
+
+def test_sampling_profiler(tmp_path):
+    with SamplingProfiler(interval=0.001) as profiler:
+        busy_wait(0.1)
+
+    assert any(stack[-1][0] == "busy_wait" for stack in profiler.samples)
+
+    collapsed_path = tmp_path / "profile.collapsed"
+    profiler.write_collapsed(str(collapsed_path))
+    lines = collapsed_path.read_text(encoding="utf-8").splitlines()
+    assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+    speedscope_path = tmp_path / "profile.speedscope.json"
+    profiler.write_speedscope(str(speedscope_path), "busy_wait")
+    speedscope = json.loads(speedscope_path.read_text(encoding="utf-8"))
+    profile = speedscope["profiles"][0]
+    assert profile["type"] == "sampled"
+    assert len(profile["samples"]) == len(profile["weights"])
+    frame_names = [frame["name"] for frame in speedscope["shared"]["frames"]]
+    assert "busy_wait" in frame_names
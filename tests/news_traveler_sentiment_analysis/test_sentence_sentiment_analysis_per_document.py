@@ -0,0 +1,50 @@
+from news_traveler_sentiment_analysis import sentiment_analysis
+from news_traveler_sentiment_analysis.sentiment_analysis import (
+    sentence_sentiment_analysis_per_document,
+    sentiment_analysis_per_document,
+)
+
+
+def test_sentence_sentiment_analysis_matches_document_analysis():
+    documents = [
+        "The economy is doing great. Markets rallied!",
+        "The results were not. Good news came later, but it was too little.",
+        "I have no. Complaints about the service?? Kind of disappointing though.",
+        "The team played TERRIBLY today. They lost again. Fans are furious 😡.",
+        "Nothing here is remarkable",
+        "",
+    ]
+    for document in documents:
+        assert sentence_sentiment_analysis_per_document(
+            document
+        ) == sentiment_analysis_per_document(document)
+
+
+def test_sentence_sentiment_analysis_reuses_sentences_across_documents():
+    boilerplate = "Subscribe now for unlimited access to great journalism."
+    first = f"Stocks fell sharply. {boilerplate} Analysts are not worried."
+    second = f"Never so happy. {boilerplate} No. Good riddance."
+    sentence_sentiment_analysis_per_document(first)
+    cached = len(sentiment_analysis._sentence_valences)
+    assert sentence_sentiment_analysis_per_document(
+        second
+    ) == sentiment_analysis_per_document(second)
+    # Only the three sentences of the second document not seen before are scored
+    assert len(sentiment_analysis._sentence_valences) == cached + 3
+
+
+def test_sentence_sentiment_analysis_without_supported_vader(monkeypatch):
+    monkeypatch.setattr(sentiment_analysis, "VADER_INTERNALS_SUPPORTED", False)
+    document = "The results were not. Good news came later."
+    assert sentence_sentiment_analysis_per_document(
+        document
+    ) == sentiment_analysis_per_document(document)
+
+
+def test_sentence_sentiment_analysis_max_length():
+    document = "The movie was wonderful. " + "The ending was awful and sad. " * 20
+    assert sentence_sentiment_analysis_per_document(document)["label"] == "NEG"
+    assert (
+        sentence_sentiment_analysis_per_document(document, max_length=28)["label"]
+        == "POS"
+    )
@@ -0,0 +1,91 @@
+import json
+import pickle
+
+from data_types import CompactNews, CompactNewsPage, News
+
+RAW_PAGE = json.dumps(
+    [
+        {
+            "source_id": f"source{i % 3}",
+            "creator": [f"Author {i % 4}"],
+            "title": f"Central bank raises rates for the {i}th time this year",
+            "content": f"Body of article {i} about rates and the economy. " * 6,
+            "link": f"https://example.com/2022/11/01/news/{i}",
+            "image_url": f"https://cdn.example.com/images/{i}.jpg",
+            "pubDate": "2022-11-01 10:00:00",
+        }
+        for i in range(10)
+    ]
+)
+
+
+def _to_news(raw: dict) -> News:
+    return {
+        "source": raw["source_id"],
+        "author": ",".join(raw["creator"]),
+        "title": raw["title"],
+        "content": raw["content"],
+        "url": raw["link"],
+        "urlToImage": raw["image_url"],
+        "publishedAt": raw["pubDate"],
+    }
+
+
+def _to_compact_news(raw: dict) -> CompactNews:
+    return CompactNews(
+        raw["source_id"],
+        ",".join(raw["creator"]),
+        raw["title"],
+        raw["content"],
+        raw["link"],
+        raw["image_url"],
+        raw["pubDate"],
+    )
+
+
+def test_compact_news_round_trip():
+    raw = json.loads(RAW_PAGE)[0]
+    compact = _to_compact_news(raw)
+    assert compact.to_news() == _to_news(raw)
+    assert compact.sentiment_kind is None
+    with_sentiment = compact.with_sentiment({"kind": "positive", "confidence": 0.4})
+    assert with_sentiment.to_news_with_sentiment() == _to_news(raw) | {
+        "sentiment": {"kind": "positive", "confidence": 0.4}
+    }
+
+
+def test_compact_news_pickle_keeps_interning():
+    raw = json.loads(RAW_PAGE)
+    first, second = (
+        pickle.loads(pickle.dumps(_to_compact_news(raw[i]))) for i in (0, 3)
+    )
+    assert first.source is second.source
+    assert first.to_news() == _to_news(raw[0])
+
+
+def test_compact_news_page_round_trip():
+    raw = json.loads(RAW_PAGE)
+    page = pickle.loads(
+        pickle.dumps(CompactNewsPage(_to_compact_news(news) for news in raw))
+    )
+    assert len(page) == len(raw)
+    assert page.sources == ["source0", "source1", "source2"]
+    assert [news.to_news() for news in page] == [_to_news(news) for news in raw]
+    assert [news.to_news() for news in page[8:]] == [_to_news(news) for news in raw[8:]]
+
+
+def test_compact_news_page_pickles_smaller_than_dicts():
+    # The cache stores pickled pages, so compare the bytes actually cached
+    raw = json.loads(RAW_PAGE)
+    dict_bytes = len(
+        pickle.dumps({"news": [_to_news(news) for news in raw], "nextOffset": 2})
+    )
+    page_bytes = len(
+        pickle.dumps(
+            {
+                "news": CompactNewsPage(_to_compact_news(news) for news in raw),
+                "nextOffset": 2,
+            }
+        )
+    )
+    assert page_bytes < dict_bytes
@@ -0,0 +1,14 @@
+import app
+
+
+def test_profile_write_failure_keeps_response(monkeypatch, tmp_path):
+    not_a_directory = tmp_path / "profiles"
+    not_a_directory.write_text("")
+    monkeypatch.setitem(app.app.config, "PROFILE_TOKEN", "secret")
+    monkeypatch.setitem(app.app.config, "PROFILE_LATENCY_THRESHOLD", 0.0)
+    monkeypatch.setitem(app.app.config, "PROFILE_DIR", str(not_a_directory))
+    response = app.app.test_client().get(
+        "/metrics", headers={"X-Profile-Token": "secret"}
+    )
+    assert response.status_code == 200
+    assert "total;dur=" in response.headers["Server-Timing"]
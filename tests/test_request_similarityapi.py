@@ -0,0 +1,57 @@
+import app
+
+BASE_ARTICLE = "The central bank raised interest rates again on Tuesday."
+
+
+def test_changing_threshold_reuses_cached_score(monkeypatch):
+    computed = []
+
+    def process_tfidf_similarity_from_counts(base_counts, counts):
+        computed.append(counts)
+        return 0.5
+
+    monkeypatch.setattr(
+        app,
+        "process_tfidf_similarity_from_counts",
+        process_tfidf_similarity_from_counts,
+    )
+    article = "Interest rates were raised by the central bank once more."
+    low = app.request_similarityapi(BASE_ARTICLE, article, 0.1)
+    high = app.request_similarityapi(BASE_ARTICLE, article, 0.9)
+    assert low == {"is_similar": True, "score": 0.5}
+    assert high == {"is_similar": False, "score": 0.5}
+    assert app.cache.get(app.similarity_key(BASE_ARTICLE, article)) == 0.5
+    assert len(computed) == 1
+
+
+def test_overlap_prune_caches_zero_score(monkeypatch):
+    computed = []
+    monkeypatch.setattr(
+        app,
+        "process_tfidf_similarity_from_counts",
+        lambda base_counts, counts: computed.append(counts) or 0.0,
+    )
+    article = "Football season opens with surprise win."
+    assert app.request_similarityapi(BASE_ARTICLE, article, 0.1) == {
+        "is_similar": False,
+        "score": 0.0,
+    }
+    assert app.cache.get(app.similarity_key(BASE_ARTICLE, article)) == 0.0
+    assert computed == []
+
+
+def test_survivor_is_tokenized_once_and_read_from_cache_once(monkeypatch):
+    tokenized = []
+    tokenize_words = app.tokenize_words
+    monkeypatch.setattr(
+        app,
+        "tokenize_words",
+        lambda document: tokenized.append(document) or tokenize_words(document),
+    )
+    reads = []
+    get = app.cache.get
+    monkeypatch.setattr(app.cache, "get", lambda key: reads.append(key) or get(key))
+    article = "Interest rates were raised by the central bank on Tuesday."
+    assert app.request_similarityapi(BASE_ARTICLE, article, 0.1)["is_similar"]
+    assert tokenized == [article]
+    assert reads.count(app.similarity_key(BASE_ARTICLE, article)) == 1
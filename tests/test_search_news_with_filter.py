@@ -0,0 +1,305 @@
+import base64
+import json
+import time
+
+import pytest
+
+import app
+from data_types import CompactNews, CompactNewsPage
+from news_traveler_admission_control.admission_control import Overloaded
+
+BASE_ARTICLE = "The central bank raised interest rates again."
+
+
+def _page(page: int, matching: bool, size: int) -> dict:
+    content = "match" if matching else "miss"
+    return {
+        "news": CompactNewsPage(
+            CompactNews(
+                "source",
+                "author",
+                f"title {page}.{i}",
+                content,
+                f"url {page}.{i}",
+                None,
+                None,
+            )
+            for i in range(size)
+        ),
+        "nextOffset": page + 1,
+    }
+
+
+class FakeNewsApi:
+    def __init__(self, matching_pages=(), upstream_pages=1, page_size=1):
+        self.matching_pages = set(matching_pages)
+        self.upstream_pages = upstream_pages
+        self.page_size = page_size
+        self.pages = []
+
+    def __call__(self, params, count, exact_count):
+        page = params["page"] or 0
+        self.pages.append(page)
+        return _page(page, page in self.matching_pages, self.page_size) | {
+            "pageCount": self.upstream_pages
+        }
+
+
+def _sentiment(content):
+    return {"value": {"kind": "positive", "confidence": 0.5}}
+
+
+def _similarity(base_article, content, similarity_threshold):
+    score = 1.0 if content == "match" else 0.0
+    return {"is_similar": score > similarity_threshold, "score": score}
+
+
+class CountingSimilarity:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, base_article, content, similarity_threshold):
+        self.calls += 1
+        return _similarity(base_article, content, similarity_threshold)
+
+
+def _search(
+    call_newsapi,
+    count=1,
+    deadline=None,
+    page_budget=5,
+    position=None,
+    call_similarityapi=_similarity,
+):
+    return app.search_news_with_filter(
+        app.generate_newsdataapi_param(
+            "rates", page=None if position is None else position["page"]
+        ),
+        count,
+        call_newsapi,
+        _sentiment,
+        call_similarityapi,
+        ["positive"],
+        0.1,
+        BASE_ARTICLE,
+        time.monotonic() + 10 if deadline is None else deadline,
+        page_budget,
+        0 if position is None else position["position"],
+    )
+
+
+def test_expired_deadline_returns_partial_without_fetching():
+    call_newsapi = FakeNewsApi()
+    result = _search(call_newsapi, deadline=time.monotonic() - 1)
+    assert call_newsapi.pages == []
+    assert result == {
+        "news": [],
+        "nextPosition": {"page": None, "position": 0},
+        "partial": True,
+    }
+
+
+def test_page_budget_stops_scan_and_resumes_at_next_page():
+    call_newsapi = FakeNewsApi(matching_pages=[1])
+    result = _search(call_newsapi, count=2, page_budget=3)
+    assert call_newsapi.pages == [0, 1, 2]
+    assert result["partial"]
+    assert [news.title for news in result["news"]] == ["title 1.0"]
+    assert result["nextPosition"] == {"page": 3, "position": 0}
+
+
+def test_page_budget_counts_upstream_pages():
+    call_newsapi = FakeNewsApi(upstream_pages=3)
+    result = _search(call_newsapi, page_budget=5)
+    assert call_newsapi.pages == [0, 1]
+    assert result["partial"]
+
+
+class OverloadedNewsApi(FakeNewsApi):
+    def __init__(self, overloaded_page, **kwargs):
+        super().__init__(**kwargs)
+        self.overloaded_page = overloaded_page
+
+    def __call__(self, params, count, exact_count):
+        if (params["page"] or 0) == self.overloaded_page:
+            raise Overloaded("newsdataapi", 503, 1)
+        return super().__call__(params, count, exact_count)
+
+
+def test_overloaded_upstream_keeps_collected_matches():
+    result = _search(
+        OverloadedNewsApi(overloaded_page=2, matching_pages=[0, 1]), count=3
+    )
+    assert [news.title for news in result["news"]] == ["title 0.0", "title 1.0"]
+    assert result["nextPosition"] == {"page": 2, "position": 0}
+    assert result["partial"]
+
+
+def test_overloaded_upstream_without_matches_is_shed(monkeypatch):
+    monkeypatch.setattr(
+        app, "request_newsdataapi", OverloadedNewsApi(overloaded_page=1)
+    )
+    monkeypatch.setattr(app, "request_sentimentapi", _sentiment)
+    monkeypatch.setattr(app, "request_similarityapi", _similarity)
+    response = _post({})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_complete_scan_is_not_partial():
+    call_newsapi = FakeNewsApi(matching_pages=[0])
+    result = _search(call_newsapi)
+    assert call_newsapi.pages == [0]
+    assert not result["partial"]
+
+
+def _post(body):
+    return app.app.test_client().post(
+        "/opposite-sentiment-news",
+        data=json.dumps(
+            {
+                "content": BASE_ARTICLE,
+                "keyword": "rates",
+                "count": 1,
+                "similarityThreshold": 0.1,
+                "sentimentFilter": ["positive"],
+            }
+            | body
+        ),
+    )
+
+
+def test_exhausted_budget_without_matches_returns_gateway_timeout(monkeypatch):
+    monkeypatch.setattr(app, "request_newsdataapi", FakeNewsApi())
+    monkeypatch.setattr(app, "request_sentimentapi", _sentiment)
+    monkeypatch.setattr(app, "request_similarityapi", _similarity)
+    response = _post({"pageBudget": 2})
+    assert response.status_code == 504
+    assert app.decode_cursor(response.get_json()["continuation"])["page"] == 2
+
+
+def test_partial_matches_are_returned_with_continuation(monkeypatch):
+    monkeypatch.setattr(app, "request_newsdataapi", FakeNewsApi(matching_pages=[0]))
+    monkeypatch.setattr(app, "request_sentimentapi", _sentiment)
+    monkeypatch.setattr(app, "request_similarityapi", _similarity)
+    response = _post({"count": 2, "pageBudget": 2})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["partial"]
+    assert body["count"] == 1
+    assert app.decode_cursor(body["continuation"])["page"] == 2
+
+
+def test_deadline_counts_time_spent_in_admission(monkeypatch):
+    call_newsapi = FakeNewsApi(matching_pages=[0])
+    monkeypatch.setattr(app, "request_newsdataapi", call_newsapi)
+    acquire = app.server_limiter.acquire
+
+    def slow_acquire(*args, **kwargs):
+        time.sleep(0.2)
+        acquire(*args, **kwargs)
+
+    monkeypatch.setattr(app.server_limiter, "acquire", slow_acquire)
+    response = _post({"deadline": 0.1})
+    assert response.status_code == 504
+    assert call_newsapi.pages == []
+
+
+def test_upstream_wait_is_capped_by_request_deadline():
+    with app.app.test_request_context():
+        assert app.admission_timeout() is None
+        app.g.request_deadline = time.monotonic() - 1
+        assert app.admission_timeout() == 0.0
+
+
+def test_invalid_deadline_is_rejected():
+    assert _post({"deadline": 0}).status_code == 400
+    assert _post({"deadline": float("nan")}).status_code == 400
+    assert _post({"deadline": float("inf")}).status_code == 400
+
+
+def test_resume_continues_at_exact_position_without_rescanning():
+    call_similarityapi = CountingSimilarity()
+    first = _search(
+        FakeNewsApi(matching_pages=[0, 1], page_size=3),
+        count=2,
+        call_similarityapi=call_similarityapi,
+    )
+    assert [news.title for news in first["news"]] == ["title 0.0", "title 0.1"]
+    assert first["nextPosition"] == {"page": None, "position": 2}
+    assert not first["partial"]
+    second = _search(
+        FakeNewsApi(matching_pages=[0, 1], page_size=3),
+        count=2,
+        position=first["nextPosition"],
+        call_similarityapi=call_similarityapi,
+    )
+    assert [news.title for news in second["news"]] == ["title 0.2", "title 1.0"]
+    assert second["nextPosition"] == {"page": 1, "position": 1}
+    # Every candidate is scored exactly once across both requests
+    assert call_similarityapi.calls == 4
+
+
+def test_cursor_round_trip():
+    position = {"page": "1667300000abc", "position": 4}
+    cursor = app.decode_cursor(app.encode_cursor("rates", BASE_ARTICLE, position))
+    assert cursor == {
+        "q": "rates",
+        "base": app.document_key(BASE_ARTICLE),
+        "page": "1667300000abc",
+        "position": 4,
+    }
+
+
+def test_malformed_cursor_is_rejected():
+    def encode(cursor):
+        return base64.urlsafe_b64encode(json.dumps(cursor).encode()).decode()
+
+    valid = {"q": "rates", "base": app.document_key(BASE_ARTICLE), "page": None}
+    for cursor in [
+        "not a cursor",
+        encode(valid | {"position": -1}),
+        encode(valid | {"position": True}),
+        encode(valid | {"page": [1], "position": 0}),
+        encode(valid | {"page": {"next": 1}, "position": 0}),
+    ]:
+        with pytest.raises(ValueError):
+            app.decode_cursor(cursor)
+
+
+def test_continuation_resumes_with_cached_base_article(monkeypatch):
+    call_newsapi = FakeNewsApi(matching_pages=[1])
+    monkeypatch.setattr(app, "request_newsdataapi", call_newsapi)
+    monkeypatch.setattr(app, "request_sentimentapi", _sentiment)
+    monkeypatch.setattr(app, "request_similarityapi", _similarity)
+    first = _post({"pageBudget": 1})
+    assert first.status_code == 504
+    response = app.app.test_client().post(
+        "/opposite-sentiment-news",
+        data=json.dumps(
+            {
+                "continuation": first.get_json()["continuation"],
+                "count": 1,
+                "similarityThreshold": 0.1,
+                "sentimentFilter": ["positive"],
+            }
+        ),
+    )
+    assert response.status_code == 200
+    assert response.get_json()["results"][0]["title"] == "title 1.0"
+    assert call_newsapi.pages == [0, 1]
+
+
+def test_null_continuation_starts_a_new_search(monkeypatch):
+    monkeypatch.setattr(app, "request_newsdataapi", FakeNewsApi(matching_pages=[0]))
+    monkeypatch.setattr(app, "request_sentimentapi", _sentiment)
+    monkeypatch.setattr(app, "request_similarityapi", _similarity)
+    response = _post({"continuation": None})
+    assert response.status_code == 200
+    assert response.get_json()["count"] == 1
+
+
+def test_continuation_for_other_content_is_rejected():
+    continuation = app.encode_cursor("rates", BASE_ARTICLE, {"page": 1, "position": 0})
+    response = _post({"content": "A different article.", "continuation": continuation})
+    assert response.status_code == 400